@@ -1,7 +1,9 @@
 from collections.abc import Sequence
-from random import shuffle
+
+import numpy as np
 
 from location import Map, City
+from kernels import route_delay, batch_route_delay
 
 
 class Order:
@@ -14,6 +16,9 @@ class Order:
         self.id: int = id
         self.city: int = city   # The destination.
 
+        # The order's array index in an order list, set by `OrderList`.
+        self.idx: int = -1
+
         # The time the customer has been waiting.
         self.wait_time: float = wait_time
         # The time limit on delivery.
@@ -25,8 +30,19 @@ class OrderList:
     """
     Order management.
     """
-    def __init__(self, orders: Sequence[Order]) -> None:
+    def __init__(self, orders: Sequence[Order], map: Map) -> None:
         self._orders: map[int, Order] = {order.id: order for order in orders}
+        for i, order in enumerate(orders):
+            order.idx = i
+
+        # Orders' destination city indices, waiting times and time limits,
+        # aligned to the orders' array indices.
+        self.city_idx: np.ndarray = np.fromiter(
+            (map.index(order.city) for order in orders), dtype=np.int32, count=len(orders))
+        self.waits: np.ndarray = np.fromiter(
+            (order.wait_time for order in orders), dtype=np.float64, count=len(orders))
+        self.limits: np.ndarray = np.fromiter(
+            (order.time_limit for order in orders), dtype=np.float64, count=len(orders))
 
     def __getitem__(self, id: int) -> Order:
         """
@@ -36,14 +52,23 @@ class OrderList:
         """
         return self._orders[id]
 
-    def random_route(self) -> 'Route':
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    @property
+    def orders(self) -> list[Order]:
+        """
+        Get all orders in array-index order.
+        """
+        return list(self._orders.values())
+
+    def random_route(self, rng: np.random.Generator) -> 'Route':
         """
         Randomly generate a route containing all orders.
+        :param rng: A random number generator.
         :return: A route.
         """
-        orders = list(self._orders.values())
-        shuffle(orders)
-        return Route(orders)
+        return Route(rng.permutation(len(self._orders)).astype(np.int32))
 
 
 class TimeOnWay:
@@ -55,10 +80,8 @@ class TimeOnWay:
         self.map: Map = map
         self.speed: float = speed
 
-        self._times: list[list[float]] = [[-1 for _ in range(len(self.map.cities))] for _ in range(len(self.map.cities))]
-
-        # Map each city's ID to its array index.
-        self._city_idx: map[int, int] = {self.map.cities[i].id: i for i in range(len(self.map.cities))}
+        # The full symmetric time matrix, indexed by city array indices.
+        self._times: np.ndarray = self.map.distances / speed
 
     def __getitem__(self, ids: tuple[int, int]) -> float:
         """
@@ -67,12 +90,14 @@ class TimeOnWay:
         :return: The time.
         """
         id1, id2 = ids
-        idx1, idx2 = self._city_idx[id1], self._city_idx[id2]
-        if self._times[idx1][idx2] < 0:
-            time = self.map.distance(id1, id2) / self.speed
-            self._times[idx1][idx2] = time
-            self._times[idx2][idx1] = time
-        return self._times[idx1][idx2]
+        return self._times[self.map.index(id1), self.map.index(id2)]
+
+    @property
+    def times(self) -> np.ndarray:
+        """
+        Get the full time matrix, indexed by city array indices.
+        """
+        return self._times
 
 
 class Route:
@@ -81,41 +106,65 @@ class Route:
     """
     time_on_way: TimeOnWay = None
     map: Map = None
+    order_list: 'OrderList' = None
 
     # The delivery company. It's a fixed starting point.
     origin: City = None
 
-    def __init__(self, orders: Sequence[Order]) -> None:
-        assert len(orders) > 0
-        self.orders: Sequence[Order] = orders
+    def __init__(self, perm: np.ndarray) -> None:
+        assert len(perm) > 0
+
+        # The delivery sequence as an array of order indices.
+        self.perm: np.ndarray = perm
 
         self._delay: float = -1
 
+    @property
+    def orders(self) -> list[Order]:
+        """
+        Get the delivery sequence as orders.
+        """
+        orders = self.order_list.orders
+        return [orders[i] for i in self.perm]
+
+    @property
+    def city_idx(self) -> np.ndarray:
+        """
+        Get the city array indices along the route, excluding the origin.
+        """
+        return self.order_list.city_idx[self.perm]
+
     @property
     def delay(self) -> float:
         """
         Get the delay time.
         """
         if self._delay < 0:
-            def calc_delay(needed: float, limit: float) -> float:
-                return max(0, needed - limit)
-
-            # Calculate the time from the origin to the first city.
-            total_needed = self.time_on_way[self.origin.id, self.orders[0].city]
-            total_delay = calc_delay(total_needed + self.orders[0].wait_time, self.orders[0].time_limit)
-
-            # Calculate the time between the other cities.
-            for i in range(1, len(self.orders)):
-                total_needed += self.time_on_way[self.orders[i - 1].city, self.orders[i].city]
-                total_delay += calc_delay(total_needed + self.orders[i].wait_time, self.orders[i].time_limit)
-            self._delay = total_delay
+            self._delay = route_delay(
+                self.perm, self.order_list.city_idx, self.time_on_way.times,
+                self.order_list.waits, self.order_list.limits, self.map.index(self.origin.id))
         return self._delay
 
+    @delay.setter
+    def delay(self, value: float) -> None:
+        assert value >= 0
+        self._delay = value
+
+    @classmethod
+    def batch_delay(cls, perms: np.ndarray) -> np.ndarray:
+        """
+        Calculate the delay times of a batch of routes in one vectorized computation.
+        :param perms: A matrix of order-index permutations, one route per row.
+        :return: The delay times, one per row.
+        """
+        return batch_route_delay(
+            perms, cls.order_list.city_idx, cls.time_on_way.times,
+            cls.order_list.waits, cls.order_list.limits, cls.map.index(cls.origin.id))
+
     def __str__(self) -> str:
-        str_repr = f"{str(self.origin)} -> "
-        for i in range(0, len(self.orders) - 1):
-            str_repr += f"{str(self.map.city(self.orders[i].city))} -> "
-        return str_repr + f"{str(self.map.city(self.orders[-1].city))}"
+        cities = self.map.cities
+        return " -> ".join([str(self.origin)] + [str(cities[i]) for i in self.city_idx])
 
     def __repr__(self) -> str:
-        return str(self)
+        # Keep the representation cheap, since the full route is O(N) to build.
+        return f"Route(orders={len(self.perm)}, delay={round(self._delay, 2)})"
@@ -1,7 +1,8 @@
+import numpy as np
 import pygame
 
 from delivery import Route
-from location import Map, City
+from location import Map
 
 
 class Displayer:
@@ -20,6 +21,14 @@ class Displayer:
         self._font: pygame.font = pygame.font.SysFont("comicsansms", 15)
         self._window: pygame.Surface = pygame.display.set_mode((width + self._MARGIN * 2, height + self._MARGIN * 2))
 
+        # Pre-render every city's ID once, since font rendering is expensive.
+        self._id_surfs: list[pygame.Surface] = [
+            self._font.render(str(city.id), True, self._BLACK) for city in map.cities]
+
+        # The delay message rendered last, reused while the delay stays the same.
+        self._delay_text: str = ""
+        self._delay_surf: pygame.Surface = None
+
     def update(self, route: Route) -> None:
         self._window.fill(self._WHITE)
         self._draw_route(route)
@@ -31,30 +40,24 @@ class Displayer:
         """
         Show a delay message.
         """
-        result_surf = self._font.render(f"The delay: {round(route.delay, 2)}", True, self._BLACK)
-        self._window.blit(result_surf, (self._MARGIN, self._window.get_height() - self._MARGIN))
+        text = f"The delay: {round(route.delay, 2)}"
+        if text != self._delay_text:
+            self._delay_text = text
+            self._delay_surf = self._font.render(text, True, self._BLACK)
+        self._window.blit(self._delay_surf, (self._MARGIN, self._window.get_height() - self._MARGIN))
 
     def _draw_route(self, route: Route) -> None:
         """
         Draw a route.
         """
-        def adjust_pos(x: float, y: float) -> tuple[float, float]:
-            """
-            Keep the margin around the window.
-            """
-            return x + self._MARGIN, y + self._MARGIN
-
-        def draw_city(city: City, color: tuple[int, int, int]) -> None:
-            pygame.draw.circle(self._window, color, adjust_pos(city.x, city.y), 5, 0)
+        # Gather all cities' pixel positions along the route in one vectorized step,
+        # keeping the margin around the window.
+        idxs = np.concatenate(([self._map.index(route.origin.id)], route.city_idx))
+        points = np.stack([self._map.xs[idxs] + self._MARGIN, self._map.ys[idxs] + self._MARGIN], axis=1)
+
+        pygame.draw.lines(self._window, self._GRAY, False, points.tolist(), 2)
+        for i, (x, y) in enumerate(points):
+            pygame.draw.circle(self._window, self._BLUE if i == 0 else self._RED, (x, y), 5, 0)
             # Show a city's ID.
             if self._show_city_id:
-                id_surf = self._font.render(str(city.id), True, self._BLACK)
-                self._window.blit(id_surf, adjust_pos(city.x, city.y))
-
-        curr = route.origin
-        draw_city(curr, self._BLUE)
-        for i in range(len(route.orders)):
-            next = self._map.city(route.orders[i].city)
-            draw_city(next, self._RED)
-            pygame.draw.line(self._window, self._GRAY, adjust_pos(curr.x, curr.y), adjust_pos(next.x, next.y), 2)
-            curr = self._map.city(route.orders[i].city)
+                self._window.blit(self._id_surfs[idxs[i]], (x, y))
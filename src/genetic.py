@@ -1,10 +1,15 @@
-from collections.abc import Iterator, Callable, Sequence
-from copy import copy
+from collections import OrderedDict
+from collections.abc import Iterator
 
 import numpy as np
 
 from delivery import Route
-from delivery import Order
+from kernels import ordered_crossover
+
+# Delay times keyed by permutation bytes, shared across generations so unchanged
+# individuals (elites, uncrossed parents, immigrants) skip re-evaluation.
+_delay_cache: OrderedDict[bytes, float] = OrderedDict()
+_DELAY_CACHE_SIZE: int = 1 << 16
 
 
 class Item:
@@ -12,22 +17,25 @@ class Item:
     An individual in a population.
     """
     def __init__(self, route: Route) -> None:
-        def calc_fitness() -> float:
-            assert route.delay >= 0
-            return 1 / (route.delay + 1)
-
         self.route: Route = route
-        self.fitness = calc_fitness()
+        self._fitness: float = -1
 
     @property
-    def dna(self) -> Sequence[Order]:
+    def fitness(self) -> float:
         """
-        Get the DNA, which is the delivery sequence.
+        Get the fitness. It is filled in batches by `Population.evaluate_all` where possible.
         """
-        return self.route.orders
-
+        if self._fitness < 0:
+            assert self.route.delay >= 0
+            self._fitness = 1 / (self.route.delay + 1)
+        return self._fitness
 
-ItemCreator = Callable[[], Item]
+    @property
+    def dna(self) -> np.ndarray:
+        """
+        Get the DNA, which is the delivery sequence as an array of order indices.
+        """
+        return self.route.perm
 
 
 class Population:
@@ -35,45 +43,110 @@ class Population:
     A population containing various individuals.
     """
     def __init__(self) -> None:
-        self.items: list[Item] = None
+        self._items: list[Item] = None
 
-    def generate(self, size: int, creator: ItemCreator) -> None:
+        # All individuals' fitness as a contiguous buffer, kept in sync with the items,
+        # along with the extrema's cached indices.
+        self._fitness: np.ndarray = None
+        self._best_idx: int = None
+        self._worst_idx: int = None
+
+    @property
+    def items(self) -> list[Item]:
+        """
+        Get all individuals.
         """
-        Randomly generate a number of individuals.
+        return self._items
+
+    @items.setter
+    def items(self, items: list[Item]) -> None:
+        self._items = items
+        self._fitness = None
+        self._best_idx = None
+        self._worst_idx = None
+
+    def generate(self, size: int, dna_len: int, rng: np.random.Generator) -> None:
+        """
+        Randomly generate a number of individuals from one batched permutation matrix.
         :param size: The size of the population.
-        :param creator: A method used to create an individual.
+        :param dna_len: The length of each individual's DNA.
+        :param rng: A random number generator.
+        """
+        assert size > 0 and dna_len > 0
+        perms = rng.permuted(np.tile(np.arange(dna_len, dtype=np.int32), (size, 1)), axis=1)
+        self.items = [Item(Route(perm)) for perm in perms]
+        self.evaluate_all()
+
+    def evaluate_all(self) -> None:
         """
-        assert size > 0
-        self.items = [creator() for _ in range(size)]
+        Evaluate all individuals' fitness in a single batched computation,
+        skipping individuals whose delay has already been computed or cached.
+        """
+        pending = []
+        for item in self.items:
+            if item._fitness >= 0:
+                continue
+            key = item.route.perm.tobytes()
+            delay = _delay_cache.get(key)
+            if delay is not None:
+                _delay_cache.move_to_end(key)
+                item.route.delay = delay
+                item._fitness = 1 / (delay + 1)
+            else:
+                pending.append((item, key))
+        if pending:
+            delays = Route.batch_delay(np.stack([item.route.perm for item, _ in pending]))
+            for (item, key), delay in zip(pending, delays):
+                delay = float(delay)
+                item.route.delay = delay
+                item._fitness = 1 / (delay + 1)
+                _delay_cache[key] = delay
+                if len(_delay_cache) > _DELAY_CACHE_SIZE:
+                    _delay_cache.popitem(last=False)
+
+        # Refresh the contiguous fitness buffer and the extrema in the same pass.
+        self._fitness = np.fromiter(
+            (item.fitness for item in self._items), dtype=np.float64, count=len(self._items))
+        self._best_idx = int(self._fitness.argmax())
+        self._worst_idx = int(self._fitness.argmin())
 
     def __getitem__(self, idx: int) -> Item:
-        return self.items[idx]
+        return self._items[idx]
 
     def __setitem__(self, idx: int, item: Item) -> None:
-        self.items[idx] = item
+        self._items[idx] = item
+        if self._fitness is not None:
+            self._fitness[idx] = item.fitness
+        self._best_idx = None
+        self._worst_idx = None
 
     @property
     def best(self) -> tuple[int, Item]:
         """
         Get the best individual and its index.
         """
-        idx = np.argmax(self.fitness)
-        return idx, self.items[idx]
+        if self._best_idx is None:
+            self._best_idx = int(np.argmax(self.fitness))
+        return self._best_idx, self._items[self._best_idx]
 
     @property
     def worst(self) -> tuple[int, Item]:
         """
         Get the worst individual and its index.
         """
-        idx = np.argmin(self.fitness)
-        return idx, self.items[idx]
+        if self._worst_idx is None:
+            self._worst_idx = int(np.argmin(self.fitness))
+        return self._worst_idx, self._items[self._worst_idx]
 
     @property
-    def fitness(self) -> list[float]:
+    def fitness(self) -> np.ndarray:
         """
         Get all individuals' fitness.
         """
-        return [item.fitness if item is not None else 0 for item in self.items]
+        if self._fitness is None:
+            self._fitness = np.fromiter(
+                (item.fitness for item in self._items), dtype=np.float64, count=len(self._items))
+        return self._fitness
 
     @property
     def size(self) -> int:
@@ -82,23 +155,22 @@ class Population:
         """
         return len(self.items)
 
-    def __copy__(self) -> 'Population':
-        new_ins = Population()
-        new_ins.items = self.items.copy()
-        return new_ins
-
 
 class Genetic:
     """
     A genetic model.
     """
-    def __init__(self, population: Population, cross_rate: float, mutate_rate: float, elitism: bool) -> None:
+    def __init__(self, population: Population, cross_rate: float, mutate_rate: float,
+                 elitism: bool, rng: np.random.Generator = None) -> None:
         self.best: Item = population.best[1]
         self.population: Population = population
         self.cross_rate: float = cross_rate
         self.mutate_rate: float = mutate_rate
         self._elitism: bool = elitism
 
+        # A dedicated generator, seedable for reproducible runs and per-island streams.
+        self._rng: np.random.Generator = rng if rng is not None else np.random.default_rng()
+
     def evolve(self, max_iter: int, max_unchanged_iter: int = 0) -> Iterator[tuple[int, Item]]:
         """
         Population evolves.
@@ -130,42 +202,39 @@ class Genetic:
 
     def _select(self) -> None:
         """
-        Select the next generation.
+        Select the next generation by roulette-wheel sampling.
         """
-        fitness = np.array(self.population.fitness)
-        self.population.items = list(np.random.choice(
-            self.population.items, size=self.population.size, replace=True, p=fitness / fitness.sum()))
+        cdf = np.cumsum(self.population.fitness)
+        picks = np.searchsorted(cdf, self._rng.random(self.population.size) * cdf[-1])
+        self.population.items = [self.population.items[i] for i in picks]
 
-    def _mutate(self, item: Item) -> Item:
+    def _mutate(self, item: Item, probs: np.ndarray, targets: np.ndarray) -> Item:
         """
-        Mutation.
+        Mutation, driven by pre-drawn random numbers.
+        :param probs: Pre-drawn mutation probabilities, one per gene.
+        :param targets: Pre-drawn swap targets, one per gene.
         """
-        new_dna = list(item.dna)
-        for i in range(len(item.dna)):
-            if np.random.rand() < self.mutate_rate:
-                # Swap two genes.
-                j = np.random.randint(0, len(item.dna))
-                new_dna[i], new_dna[j] = new_dna[j], new_dna[i]
+        mutated = np.flatnonzero(probs < self.mutate_rate)
+        if mutated.size == 0:
+            return item
+        new_dna = item.dna.copy()
+        for i in mutated:
+            # Swap two genes.
+            j = targets[i]
+            new_dna[i], new_dna[j] = new_dna[j], new_dna[i]
         return Item(Route(new_dna))
 
-    def _crossover(self, item: Item, population: Population) -> Item:
+    def _crossover(self, item: Item, parent: Item, prob: float, bounds: np.ndarray) -> Item:
         """
-        Ordered crossover.
+        Ordered crossover, driven by pre-drawn random numbers.
+        :param prob: A pre-drawn crossover probability.
+        :param bounds: Two pre-drawn subsequence boundaries.
         """
-        if np.random.rand() < self.cross_rate:
-            # Pick another parent.
-            parent = population.items[np.random.randint(0, population.size)]
-
-            # Randomly select a subsequence of the first parent's DNA.
-            idx1, idx2 = np.random.randint(0, len(item.dna)), np.random.randint(0, len(item.dna))
-            begin, end = min(idx1, idx2), max(idx1, idx2)
-
-            dna1 = []
-            for i in range(begin, end):
-                dna1.append(item.dna[i])
-            # Then fill the remainder with DNA from the second parent in the order in which they appear, without duplicate.
-            dna2 = [gene for gene in parent.dna if gene not in dna1]
-            return Item(Route(dna1 + dna2))
+        if prob < self.cross_rate:
+            # Keep a random subsequence of the first parent's DNA and fill the remainder
+            # with DNA from the second parent in the order in which they appear, without duplicate.
+            begin, end = min(bounds[0], bounds[1]), max(bounds[0], bounds[1])
+            return Item(Route(ordered_crossover(item.dna, parent.dna, begin, end)))
         else:
             return item
 
@@ -173,10 +242,21 @@ class Genetic:
         prev_best = self.population.best[1] if self._elitism else None
 
         self._select()
-        copied_pop = copy(self.population)
-        for i in range(self.population.size):
-            child = self._crossover(self.population.items[i], copied_pop)
-            self.population.items[i] = self._mutate(child)
+        # Partners are read from the pre-mutation pool, so crossover can pick them
+        # by index without snapshotting the item list. All random numbers for the
+        # generation are drawn in bulk instead of one call per gene.
+        parents = self.population.items
+        size, dna_len = len(parents), len(parents[0].dna)
+        partners = self._rng.integers(0, size, size=size)
+        cross_probs = self._rng.random(size)
+        cross_bounds = self._rng.integers(0, dna_len, size=(size, 2))
+        mut_probs = self._rng.random((size, dna_len))
+        swap_targets = self._rng.integers(0, dna_len, size=(size, dna_len))
+        self.population.items = [
+            self._mutate(self._crossover(parents[i], parents[partners[i]], cross_probs[i], cross_bounds[i]),
+                         mut_probs[i], swap_targets[i])
+            for i in range(size)]
+        self.population.evaluate_all()
 
         # Elitism: Keep the best individual from the previous generation.
         if prev_best:
@@ -0,0 +1,74 @@
+from collections.abc import MutableSequence, Sequence
+
+import numpy as np
+
+from location import Map, City
+from delivery import Order, OrderList, Route, TimeOnWay
+from genetic import Genetic, Item, Population
+
+# A published individual: its fitness and its delivery sequence.
+Migrant = tuple[float, np.ndarray]
+
+
+def setup_routes(city_data: Sequence[tuple[int, float, float]],
+                 order_data: Sequence[tuple[int, int, float, float]], speed: float) -> OrderList:
+    """
+    Rebuild the delivery problem and wire up the `Route` class attributes.
+    Each worker process must call this before evolving.
+    :param city_data: Cities as `(ID, x, y)` tuples. The first city is the origin.
+    :param order_data: Orders as `(ID, city, wait_time, time_limit)` tuples.
+    :param speed: The delivery man's speed.
+    :return: The order list.
+    """
+    cities = [City(id, x, y) for id, x, y in city_data]
+    Route.map = Map(cities)
+    Route.time_on_way = TimeOnWay(Route.map, speed)
+    Route.origin = cities[0]
+    orders = OrderList([Order(id, city, wait, limit) for id, city, wait, limit in order_data], Route.map)
+    Route.order_list = orders
+    return orders
+
+
+def run_island(idx: int, seed: int, city_data: Sequence[tuple[int, float, float]],
+               order_data: Sequence[tuple[int, int, float, float]], cfg: dict,
+               shared_best: MutableSequence[Migrant]) -> tuple[float, np.ndarray]:
+    """
+    Evolve one island's population, exchanging individuals with the other islands.
+    Every `migrateEvery` generations the island publishes its best individual to
+    `shared_best` and lets the fittest immigrant replace its worst individual.
+    :param idx: The island's index in `shared_best`.
+    :param seed: The island's random seed.
+    :param city_data: Cities as `(ID, x, y)` tuples. The first city is the origin.
+    :param order_data: Orders as `(ID, city, wait_time, time_limit)` tuples.
+    :param cfg: The configuration.
+    :param shared_best: A shared list with one slot per island.
+    :return: The fitness and the delivery sequence of the island's best individual.
+    """
+    rng = np.random.default_rng(seed)
+    orders = setup_routes(city_data, order_data, cfg["speed"])
+
+    population = Population()
+    population.generate(cfg["populationSize"], len(orders), rng)
+    genetic = Genetic(population, cfg["rate"]["cross"], cfg["rate"]["mutate"], cfg["elitism"], rng)
+
+    migrate_every = cfg["islands"]["migrateEvery"]
+    for i, _ in genetic.evolve(cfg["maxIter"]["total"], cfg["maxIter"]["unchanged"]):
+        if (i + 1) % migrate_every == 0:
+            shared_best[idx] = (genetic.best.fitness, np.asarray(genetic.best.route.perm))
+            _immigrate(population, shared_best, idx)
+
+    shared_best[idx] = (genetic.best.fitness, np.asarray(genetic.best.route.perm))
+    return genetic.best.fitness, np.asarray(genetic.best.route.perm)
+
+
+def _immigrate(population: Population, shared_best: MutableSequence[Migrant], idx: int) -> None:
+    """
+    Replace the population's worst individual with the fittest published immigrant.
+    """
+    migrants = [migrant for i, migrant in enumerate(shared_best) if i != idx and migrant is not None]
+    if not migrants:
+        return
+    fitness, perm = max(migrants, key=lambda migrant: migrant[0])
+    worst_idx, worst = population.worst
+    if worst.fitness < fitness:
+        population[worst_idx] = Item(Route(np.asarray(perm, dtype=np.int32)))
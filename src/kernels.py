@@ -0,0 +1,73 @@
+import numpy as np
+from numba import njit, prange
+
+
+# Explicit signatures make the kernels compile eagerly at import time, before the
+# window opens, and let cache=True reuse the compiled code across runs.
+@njit("f8(i4[:], i4[:], f8[:, :], f8[:], f8[:], i8)", cache=True, fastmath=True)
+def route_delay(perm: np.ndarray, city_idx: np.ndarray, times: np.ndarray,
+                waits: np.ndarray, limits: np.ndarray, origin: int) -> float:
+    """
+    Calculate a route's delay time.
+    :param perm: The delivery sequence as an array of order indices.
+    :param city_idx: Orders' destination city indices.
+    :param times: The full time matrix, indexed by city array indices.
+    :param waits: Orders' waiting times.
+    :param limits: Orders' time limits.
+    :param origin: The origin's city array index.
+    :return: The delay time.
+    """
+    first = perm[0]
+    total_needed = times[origin, city_idx[first]]
+    delay = max(0.0, total_needed + waits[first] - limits[first])
+    for i in range(1, perm.shape[0]):
+        curr = perm[i]
+        total_needed += times[city_idx[perm[i - 1]], city_idx[curr]]
+        delay += max(0.0, total_needed + waits[curr] - limits[curr])
+    return delay
+
+
+@njit("i4[:](i4[:], i4[:], i8, i8)", cache=True)
+def ordered_crossover(perm1: np.ndarray, perm2: np.ndarray, begin: int, end: int) -> np.ndarray:
+    """
+    Cross two permutations: keep `perm1[begin:end]`, then fill the remainder with
+    the genes of `perm2` in the order in which they appear, without duplicate.
+    :param perm1: The first parent's permutation.
+    :param perm2: The second parent's permutation.
+    :param begin: The beginning of the kept subsequence.
+    :param end: The end of the kept subsequence.
+    :return: The child permutation.
+    """
+    count = perm1.shape[0]
+    child = np.empty(count, dtype=np.int32)
+    present = np.zeros(count, dtype=np.bool_)
+    for i in range(begin, end):
+        gene = perm1[i]
+        child[i - begin] = gene
+        present[gene] = True
+    pos = end - begin
+    for i in range(count):
+        gene = perm2[i]
+        if not present[gene]:
+            child[pos] = gene
+            pos += 1
+    return child
+
+
+@njit("f8[:](i4[:, :], i4[:], f8[:, :], f8[:], f8[:], i8)", cache=True, parallel=True, fastmath=True)
+def batch_route_delay(perms: np.ndarray, city_idx: np.ndarray, times: np.ndarray,
+                      waits: np.ndarray, limits: np.ndarray, origin: int) -> np.ndarray:
+    """
+    Calculate the delay times of a batch of routes.
+    :param perms: A matrix of order-index permutations, one route per row.
+    :param city_idx: Orders' destination city indices.
+    :param times: The full time matrix, indexed by city array indices.
+    :param waits: Orders' waiting times.
+    :param limits: Orders' time limits.
+    :param origin: The origin's city array index.
+    :return: The delay times, one per row.
+    """
+    delays = np.empty(perms.shape[0], dtype=np.float64)
+    for i in prange(perms.shape[0]):
+        delays[i] = route_delay(perms[i], city_idx, times, waits, limits, origin)
+    return delays
@@ -1,5 +1,7 @@
 from collections.abc import Sequence
 
+import numpy as np
+
 
 class City:
     def __init__(self, id: int, x: float, y: float) -> None:
@@ -34,15 +36,20 @@ class Map:
         assert len(cities) > 0
         self.cities: Sequence[City] = cities
 
-        # Map each city's ID to its array index.
-        self._idx: map[int, int] = {cities[i].id: i for i in range(len(cities))}
+        # Map each city's ID to its array index through a dense lookup table,
+        # so each lookup is a single array read instead of a dict hash.
+        ids = np.fromiter((city.id for city in cities), dtype=np.int64, count=len(cities))
+        assert ids.min() >= 0
+        self._id_to_idx: np.ndarray = np.full(ids.max() + 1, -1, dtype=np.int32)
+        self._id_to_idx[ids] = np.arange(len(cities), dtype=np.int32)
+
+        # Cities' coordinates as parallel arrays, aligned to the cities' array indices.
+        self.xs: np.ndarray = np.fromiter((city.x for city in cities), dtype=np.float64, count=len(cities))
+        self.ys: np.ndarray = np.fromiter((city.y for city in cities), dtype=np.float64, count=len(cities))
 
-        self._dists: list[list[float]] = [[0 for _ in range(len(cities))] for _ in range(len(cities))]
-        for i in range(len(cities)):
-            for j in range(i + 1, len(cities)):
-                dist = cities[i].distance(cities[j])
-                self._dists[i][j] = dist
-                self._dists[j][i] = dist
+        # Build the full symmetric distance matrix in one vectorized step.
+        self._dists: np.ndarray = np.hypot(
+            self.xs[:, None] - self.xs[None, :], self.ys[:, None] - self.ys[None, :])
 
     def distance(self, id1: int, id2: int) -> float:
         """
@@ -51,8 +58,22 @@ class Map:
         :param id2: Another city.
         :return: The distance.
         """
-        idx1, idx2 = self._idx[id1], self._idx[id2]
-        return self._dists[idx1][idx2]
+        return self._dists[self._id_to_idx[id1], self._id_to_idx[id2]]
+
+    @property
+    def distances(self) -> np.ndarray:
+        """
+        Get the full distance matrix, indexed by city array indices.
+        """
+        return self._dists
+
+    def index(self, id: int) -> int:
+        """
+        Get a city's array index.
+        :param id: A city's ID.
+        :return: The city's array index.
+        """
+        return int(self._id_to_idx[id])
 
     def city(self, id: int) -> City:
         """
@@ -60,4 +81,4 @@ class Map:
         :param id: A city's ID.
         :return: The city's information.
         """
-        return self.cities[self._idx[id]]
+        return self.cities[self._id_to_idx[id]]
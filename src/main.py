@@ -1,14 +1,18 @@
 import logging
+import multiprocessing
+import os
 import sys
 import json
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from pygame.locals import *
 
 from delivery import *
 from genetic import *
 from displayer import *
+from island import run_island
 
 
 def load_config(path: Path) -> dict:
@@ -21,12 +25,18 @@ def load_config(path: Path) -> dict:
         raise ValueError("The speed must be greater than 0")
     if cfg["fps"] < 0:
         raise ValueError("The Negative FPS is not allowed")
+    if cfg["gensPerFrame"] <= 0:
+        raise ValueError("The generation count per frame must be greater than 0")
     if cfg["mapSize"]["width"] <= 0 or cfg["mapSize"]["height"] <= 0:
         raise ValueError("The width and height of map must be greater than 0")
     if cfg["populationSize"] <= 0:
         raise ValueError("The population size must be greater than 0")
     if cfg["maxIter"]["total"] <= 0:
         raise ValueError("The maximum iteration count must be greater than 0")
+    if cfg["islands"]["count"] <= 0:
+        raise ValueError("The island count must be greater than 0")
+    if cfg["islands"]["migrateEvery"] <= 0:
+        raise ValueError("The migration interval must be greater than 0")
 
     cfg["rate"]["cross"] = min(1, max(0, cfg["rate"]["cross"]))
     cfg["rate"]["mutate"] = min(1, max(0, cfg["rate"]["mutate"]))
@@ -34,7 +44,7 @@ def load_config(path: Path) -> dict:
     return cfg
 
 
-def load_orders(cities: set[int]) -> OrderList:
+def load_orders(cities: set[int], map: Map) -> OrderList:
     """
     Load delivery orders.
     """
@@ -60,7 +70,7 @@ def load_orders(cities: set[int]) -> OrderList:
         orders.append(Order(order.name, city, wait_time, time_limit))
 
     df.apply(_append, axis="columns")
-    return OrderList(orders)
+    return OrderList(orders, map)
 
 
 def load_cities(width: int, height: int) -> tuple[list[City], set[int]]:
@@ -85,29 +95,22 @@ def load_cities(width: int, height: int) -> tuple[list[City], set[int]]:
     return cities, set(df.index)
 
 
-def main():
-    cfg = load_config(Path(__file__).parent.joinpath("config.json"))
-
-    # Load cities and delivery orders.
-    width, height = cfg["mapSize"]["width"], cfg["mapSize"]["height"]
-    cities, city_ids = load_cities(width, height)
-    orders = load_orders(city_ids)
-    Route.map = Map(cities)
-    Route.time_on_way = TimeOnWay(Route.map, cfg["speed"])
-    Route.origin = cities[0]
-
+def evolve_serial(cfg: dict, orders: OrderList, display: Displayer) -> None:
+    """
+    Evolve a single population, displaying its best route.
+    """
     # Create a population.
+    rng = np.random.default_rng()
     population = Population()
-    population.generate(cfg["populationSize"], lambda: Item(orders.random_route()))
-    genetic = Genetic(population, cfg["rate"]["cross"], cfg["rate"]["mutate"], cfg["elitism"])
+    population.generate(cfg["populationSize"], len(orders), rng)
+    genetic = Genetic(population, cfg["rate"]["cross"], cfg["rate"]["mutate"], cfg["elitism"], rng)
 
     # Create a genetic model.
     generation = genetic.evolve(cfg["maxIter"]["total"], cfg["maxIter"]["unchanged"])
 
-    pygame.init()
-    pygame.display.set_caption("Genetic Delivery Man")
-    display = Displayer(Route.map, width, height, cfg["fps"], cfg["showCityID"])
-
+    # The renderer is throttled separately from the evolution: several generations
+    # run per displayed frame and the frame is only redrawn when the best changed.
+    best_fitness = -1
     end = False
     while True:
         for event in pygame.event.get():
@@ -116,13 +119,85 @@ def main():
                 sys.exit()
         if not end:
             try:
-                next(generation)
-                display.update(genetic.best.route)
+                for _ in range(cfg["gensPerFrame"]):
+                    next(generation)
             except StopIteration:
                 end = True
                 route = genetic.best.route
                 print(f"The shortest delay: {round(route.delay, 2)}")
                 print(f"\t{route}")
+            if not cfg["headless"] and genetic.best.fitness != best_fitness:
+                best_fitness = genetic.best.fitness
+                display.update(genetic.best.route)
+
+
+def evolve_parallel(cfg: dict, cities: list[City], orders: OrderList, display: Displayer) -> None:
+    """
+    Evolve multiple island populations in parallel processes, displaying the global best route.
+    """
+    city_data = [(city.id, city.x, city.y) for city in cities]
+    order_data = [(order.id, order.city, order.wait_time, order.time_limit) for order in orders.orders]
+    count = cfg["islands"]["count"]
+    seeds = np.random.default_rng().integers(0, 2 ** 31 - 1, size=count)
+
+    # Spawn fresh workers instead of forking: the Numba threading layer (and SDL)
+    # initialized in this process is not fork-safe and deadlocks on interpreter exit.
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Manager() as manager, ctx.Pool(min(count, os.cpu_count())) as pool:
+        shared_best = manager.list([None] * count)
+        results = [pool.apply_async(run_island, (i, int(seeds[i]), city_data, order_data, cfg, shared_best))
+                   for i in range(count)]
+
+        best_fitness = -1
+        end = False
+        while True:
+            for event in pygame.event.get():
+                if event.type == QUIT:
+                    pool.terminate()
+                    pygame.quit()
+                    sys.exit()
+            if not end:
+                if all(result.ready() for result in results):
+                    end = True
+                    _, perm = max((result.get() for result in results), key=lambda best: best[0])
+                    route = Route(np.asarray(perm, dtype=np.int32))
+                    if not cfg["headless"]:
+                        display.update(route)
+                    print(f"The shortest delay: {round(route.delay, 2)}")
+                    print(f"\t{route}")
+                    continue
+
+                # Display the best route published by the islands so far.
+                migrants = [migrant for migrant in shared_best if migrant is not None]
+                if migrants:
+                    fitness, perm = max(migrants, key=lambda migrant: migrant[0])
+                    if fitness > best_fitness:
+                        best_fitness = fitness
+                        if not cfg["headless"]:
+                            display.update(Route(np.asarray(perm, dtype=np.int32)))
+                pygame.time.wait(100)
+
+
+def main():
+    cfg = load_config(Path(__file__).parent.joinpath("config.json"))
+
+    # Load cities and delivery orders.
+    width, height = cfg["mapSize"]["width"], cfg["mapSize"]["height"]
+    cities, city_ids = load_cities(width, height)
+    Route.map = Map(cities)
+    Route.time_on_way = TimeOnWay(Route.map, cfg["speed"])
+    Route.origin = cities[0]
+    orders = load_orders(city_ids, Route.map)
+    Route.order_list = orders
+
+    pygame.init()
+    pygame.display.set_caption("Genetic Delivery Man")
+    display = Displayer(Route.map, width, height, cfg["fps"], cfg["showCityID"])
+
+    if cfg["islands"]["count"] > 1:
+        evolve_parallel(cfg, cities, orders, display)
+    else:
+        evolve_serial(cfg, orders, display)
 
 
 if __name__ == "__main__":